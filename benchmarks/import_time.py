@@ -0,0 +1,110 @@
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "maker": os.path.join(ROOT, "maker-example"),
+    "taker": os.path.join(ROOT, "taker-example"),
+}
+
+# modules that must not be loaded just by importing an entry point
+HEAVY_MODULES = ["pandas", "numpy", "ta", "polygon"]
+
+# imports the entry point, then the polygon client it loads when its feed
+# starts; together these are the imports paid before the first feed connects
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import app
+app_import = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+from common.tasks import load_polygon
+start = time.perf_counter()
+load_polygon()
+polygon_import = time.perf_counter() - start
+print(app_import)
+print(polygon_import)
+print(",".join(heavy))
+"""
+
+
+def measure(cwd: str) -> tuple:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    launch = time.perf_counter() - start
+    app_import, polygon_import, heavy = result.stdout.split("\n")[:3]
+    return (
+        launch,
+        float(app_import),
+        float(polygon_import),
+        [m for m in heavy.split(",") if m],
+    )
+
+
+def report(name: str, label: str, timings: list) -> float:
+    median = statistics.median(timings)
+    print(
+        f"{name}: {label} median={median:.1f}ms "
+        f"min={min(timings):.1f}ms max={max(timings):.1f}ms"
+    )
+    return median
+
+
+def main(args) -> int:
+    failed = False
+    for name, cwd in ENTRY_POINTS.items():
+        launches, app_imports, polygon_imports = [], [], []
+        heavy = []
+        for _ in range(args.runs):
+            launch, app_import, polygon_import, heavy = measure(cwd)
+            launches.append(launch * 1000)
+            app_imports.append(app_import * 1000)
+            polygon_imports.append(polygon_import * 1000)
+
+        print(f"{name}: runs={args.runs}")
+        report(name, "app import", app_imports)
+        report(name, "polygon import (deferred)", polygon_imports)
+        median = report(name, "launch incl. all imports", launches)
+        if heavy:
+            print(f"{name}: heavy modules loaded at import: {', '.join(heavy)}")
+            failed = True
+        if args.budget is not None and median > args.budget:
+            print(f"{name}: median launch time exceeds budget of {args.budget:.1f}ms")
+            failed = True
+
+    return 1 if failed else 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measures cold start import time of the example entry points"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        help="Number of fresh interpreters per entry point",
+        default=10,
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="Fail if the median launch time exceeds this (ms)",
+        default=None,
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,21 @@
+import random
+
+
+class Backoff:
+    def __init__(
+        self, initial: float = 0.5, maximum: float = 30.0, factor: float = 2.0
+    ):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.attempts: int = 0
+
+    # returns the next delay using "full jitter": uniform in [0, capped exponential]
+    def next_delay(self) -> float:
+        cap = min(self.maximum, self.initial * self.factor**self.attempts)
+        self.attempts += 1
+        return random.uniform(0, cap)
+
+    # invoked once a connection is healthy again
+    def reset(self) -> None:
+        self.attempts = 0
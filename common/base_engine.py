@@ -1,9 +1,17 @@
+from __future__ import annotations
+
 import logging
+import time
 import requests
-from typing import Dict, List, Union
-from polygon.websocket.models import EquityQuote, EquityAgg
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Union
 from .models import Order, Trade, Position, EngineConfig
 
+if TYPE_CHECKING:
+    from polygon.websocket.models import EquityQuote, EquityAgg
+
+# replays only need deduplicating against recent trades
+MAX_SEEN_TRADES = 10000
+
 
 class BaseEngine:
     def __init__(self, config: EngineConfig):
@@ -16,23 +24,39 @@ class BaseEngine:
         self.quotes: Dict[str, EquityQuote] = {}
         self.agg_sec: Dict[str, EquityAgg] = {}
         self.agg_min: Dict[str, EquityAgg] = {}
+        self.order_versions: Dict[str, int] = {}
+        self.seen_trades: Dict[str, None] = {}
+        self.resyncing = False
+        self.replayed_orders: Set[str] = set()
+        self.disconnected_at: Dict[str, float] = {}
+        self.recovery_times: List[Tuple[str, float]] = []
         self.config.validate()
         self.cancel_all_orders()
 
     # invoked when all replayed data has been received
     def on_ready(self):
+        if self.resyncing:
+            self.reconcile()
         self.ready = True
         logging.info(
             "%s engine ready, position = %d", self.config.symbol, self.position
         )
 
-    # invoked when an order state updates from studio
-    def on_order_update(self, timestamp: int, order: Order) -> None:
+    # invoked when an order state updates from studio; returns whether it was applied
+    def on_order_update(self, timestamp: int, order: Order) -> bool:
         if not order.order_id in self.submitted_orders:
-            return
+            return False
 
         if order.symbol != self.config.symbol:
-            return
+            return False
+
+        if self.resyncing:
+            self.replayed_orders.add(order.order_id)
+
+        # replays after a reconnect resend known versions; only apply deltas
+        if order.version <= self.order_versions.get(order.order_id, -1):
+            return False
+        self.order_versions[order.order_id] = order.version
 
         if order.state == "rejected":
             logging.warn("Order %s rejected: %s", order.order_id, order.text)
@@ -45,11 +69,19 @@ class BaseEngine:
         else:
             self.open_orders[order.order_id] = order
 
+        return True
+
     # invoked when a trade occurs against an open order from studio
     def on_trade_notice(self, timestamp: int, trade: Trade) -> None:
         if trade.symbol != self.config.symbol:
             return
 
+        if trade.trade_id in self.seen_trades:
+            return
+        self.seen_trades[trade.trade_id] = None
+        if len(self.seen_trades) > MAX_SEEN_TRADES:
+            self.seen_trades.pop(next(iter(self.seen_trades)))
+
         logging.info(
             "%s trade: %s %s @ %s",
             self.config.symbol,
@@ -63,7 +95,11 @@ class BaseEngine:
         if position.symbol != self.config.symbol:
             return
 
-        self.position = int(position.quantity)
+        quantity = int(position.quantity)
+        if quantity == self.position:
+            return
+
+        self.position = quantity
         logging.info("%s position: %s", self.config.symbol, self.position)
 
     # invoked when a quote update occurs from polygon
@@ -81,6 +117,48 @@ class BaseEngine:
     def on_timer(self) -> None:
         pass
 
+    # invoked when a feed drops; studio state is resynced from the next replay,
+    # and polygon market data is discarded so nothing trades off stale quotes
+    def on_disconnect(self, feed: str) -> None:
+        self.disconnected_at.setdefault(feed, time.monotonic())
+        if feed == "studio":
+            self.ready = False
+            self.resyncing = True
+            self.replayed_orders = set()
+        elif feed == "polygon":
+            self.quotes.clear()
+            self.agg_sec.clear()
+            self.agg_min.clear()
+
+    # invoked when a feed is usable again after a disconnect
+    def on_recovered(self, feed: str) -> None:
+        started = self.disconnected_at.pop(feed, None)
+        if started is None:
+            return
+
+        elapsed = time.monotonic() - started
+        self.recovery_times.append((feed, elapsed))
+        logging.info("%s feed recovered in %.3fs", feed, elapsed)
+
+    # cancels open orders that studio no longer reports after a replay. a live
+    # order stays tracked until its cancel is confirmed; if the cancel is refused
+    # the order is already terminal and studio will not report it again
+    def reconcile(self) -> None:
+        for order in list(self.open_orders.values()):
+            if order.order_id in self.replayed_orders:
+                continue
+
+            logging.warning("Order %s missing from replay, cancelling", order.order_id)
+            try:
+                self.cancel_order(order)
+            except RuntimeError as e:
+                logging.warning("%s; dropping order %s", e, order.order_id)
+                self.open_orders.pop(order.order_id)
+
+        self.resyncing = False
+        self.replayed_orders = set()
+        self.on_recovered("studio")
+
     def submit_order(self, side: str, quantity: int, price: str, tif: str) -> str:
         logging.info("Submitting order: %s %d @ %s...", side, quantity, price)
 
@@ -1,18 +1,40 @@
+from __future__ import annotations
+
 import json
 import asyncio
 import websockets
 import logging
 import time
 
-from polygon import WebSocketClient
-from polygon.websocket.models import WebSocketMessage, EquityQuote, EquityAgg
-from polygon.websocket.models.common import Feed
 from .models import Order, Trade, Position
 from .base_engine import BaseEngine
-from typing import List
+from .backoff import Backoff
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from polygon.websocket.models import WebSocketMessage, EquityQuote, EquityAgg
+
+# websocket pings double as heartbeats; a missed pong drops the connection. the
+# engines make blocking HTTP calls on the event loop, so the timeout must outlast
+# the worst-case stall or healthy connections get dropped
+HEARTBEAT_INTERVAL = 20
+HEARTBEAT_TIMEOUT = 20
+
+RECONNECT_ERRORS = (websockets.WebSocketException, OSError, asyncio.TimeoutError)
+
+
+# the polygon client is slow to import; it is loaded when the polygon feed starts
+# so that importing the engines stays cheap. this does not shorten the path to
+# the first order, which needs polygon data anyway
+def load_polygon():
+    from polygon import WebSocketClient
+    from polygon.websocket.models.common import Feed
+
+    return WebSocketClient, Feed
 
 
 async def polygon_processor(engine: BaseEngine, msgs: List[WebSocketMessage]):
+    engine.on_recovered("polygon")
     for msg in msgs:
         if msg.event_type == "Q":
             msg: EquityQuote = msg
@@ -31,10 +53,55 @@ async def ws_polgon_task(engine: BaseEngine, symbols: List[str], api_key: str):
         + [f"A.{symbol}" for symbol in symbols]
         + [f"AM.{symbol}" for symbol in symbols]
     )
-    ws = WebSocketClient(
-        api_key=api_key, feed=Feed.PolyFeed, subscriptions=subscriptions, verbose=True
-    )
-    await ws.connect(processor=lambda msgs: polygon_processor(engine, msgs))
+    WebSocketClient, Feed = load_polygon()
+    backoff = Backoff()
+    received = False
+
+    async def processor(msgs: List[WebSocketMessage]):
+        nonlocal received
+        received = True
+        await polygon_processor(engine, msgs)
+
+    while True:
+        # drops of an established connection are retried here rather than by the
+        # client library; failed handshakes are still retried inside the
+        # websockets connect iterator with its own backoff
+        received = False
+        ws = WebSocketClient(
+            api_key=api_key,
+            feed=Feed.PolyFeed,
+            subscriptions=subscriptions,
+            verbose=True,
+            max_reconnects=0,
+        )
+        try:
+            await ws.connect(
+                processor=processor,
+                ping_interval=HEARTBEAT_INTERVAL,
+                ping_timeout=HEARTBEAT_TIMEOUT,
+            )
+            logging.warning("polygon websocket closed")
+        except RECONNECT_ERRORS as e:
+            logging.warning("polygon websocket disconnected: %s", e)
+
+        if received:
+            backoff.reset()
+        engine.on_disconnect("polygon")
+        delay = backoff.next_delay()
+        logging.info("reconnecting to polygon in %.2fs", delay)
+        await asyncio.sleep(delay)
+
+
+def studio_processor(engine: BaseEngine, payload: dict):
+    timestamp = int(time.time() * 1000)
+    if payload["type"] == "order-update":
+        engine.on_order_update(timestamp, Order(**payload["data"]))
+    elif payload["type"] == "trade-notice":
+        engine.on_trade_notice(timestamp, Trade(**payload["data"]))
+    elif payload["type"] == "position-update":
+        engine.on_position_update(timestamp, Position(**payload["data"]))
+    elif payload["type"] == "replay-complete":
+        engine.on_ready()
 
 
 async def ws_studio_task(engine: BaseEngine, url: str, auth: str, account: str):
@@ -46,21 +113,26 @@ async def ws_studio_task(engine: BaseEngine, url: str, auth: str, account: str):
     url = f"{url}/v2/ws"
     logging.info("connect: %s", url)
 
-    async with websockets.connect(url) as ws:
-        await ws.send(json.dumps(msg))
-        logging.info("studio websocket connected")
-        while True:
-            msg = await ws.recv()
-            timestamp = int(time.time() * 1000)
-            payload = json.loads(msg)["payload"]
-            if payload["type"] == "order-update":
-                engine.on_order_update(timestamp, Order(**payload["data"]))
-            elif payload["type"] == "trade-notice":
-                engine.on_trade_notice(timestamp, Trade(**payload["data"]))
-            elif payload["type"] == "position-update":
-                engine.on_position_update(timestamp, Position(**payload["data"]))
-            elif payload["type"] == "replay-complete":
-                engine.on_ready()
+    backoff = Backoff()
+    while True:
+        try:
+            async with websockets.connect(
+                url, ping_interval=HEARTBEAT_INTERVAL, ping_timeout=HEARTBEAT_TIMEOUT
+            ) as ws:
+                await ws.send(json.dumps(msg))
+                logging.info("studio websocket connected")
+                while True:
+                    payload = json.loads(await ws.recv())["payload"]
+                    studio_processor(engine, payload)
+                    if payload["type"] == "replay-complete":
+                        backoff.reset()
+        except RECONNECT_ERRORS as e:
+            logging.warning("studio websocket disconnected: %s", e)
+
+        engine.on_disconnect("studio")
+        delay = backoff.next_delay()
+        logging.info("reconnecting to studio in %.2fs", delay)
+        await asyncio.sleep(delay)
 
 
 async def timer_task(engine: BaseEngine):
@@ -1,15 +1,18 @@
+from __future__ import annotations
+
 import logging
 import math
 import random
 import time
-import pandas as pd
 
 from dataclasses import dataclass
-from typing import List
-from polygon.websocket.models import EquityQuote
+from typing import TYPE_CHECKING, List
 from common import BaseEngine
 from common.models import Order, EngineConfig
 
+if TYPE_CHECKING:
+    from polygon.websocket.models import EquityQuote
+
 @dataclass
 class Stats:
     submitted_at: int
@@ -31,13 +34,23 @@ class Engine(BaseEngine):
         if self.min_edge < self.config.min_tick:
             raise ValueError("min_tick must be greater than min_edge")
 
-    def on_order_update(self, timestamp: int, order: Order) -> None:
-        super().on_order_update(timestamp, order)
+    def on_order_update(self, timestamp: int, order: Order) -> bool:
+        if not super().on_order_update(timestamp, order):
+            return False
+
         stats = list(filter(lambda x: x.order_id == order.order_id, self.stats))
         if len(stats) > 0:
             stats[0].acked_at = timestamp
 
         self.dirty = True
+        return True
+
+    def on_disconnect(self, feed: str) -> None:
+        super().on_disconnect(feed)
+        # without market data there is no theo; eval then pulls all quotes
+        if feed == "polygon":
+            self.theo = math.nan
+            self.dirty = True
 
     def on_quote_update(self, quote: EquityQuote) -> None:
         super().on_quote_update(quote)
@@ -121,8 +134,14 @@ class Engine(BaseEngine):
         self.stats.append(Stats(submitted_at=timestamp, acked_at=0, order_id=order_id))
 
     def dump_stats(self):
+        # pandas is only needed here, so keep it off the startup path
+        import pandas as pd
+
         df = pd.DataFrame([x.acked_at - x.submitted_at for x in self.stats], columns=["latency"])
         logging.info("latency data:\n%s", df.describe())
         logging.info("latency percentiles:\n%s", df["latency"].quantile([0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]))
+        if len(self.recovery_times) > 0:
+            df = pd.DataFrame(self.recovery_times, columns=["feed", "recovery"])
+            logging.info("time-to-recover (s):\n%s", df.groupby("feed")["recovery"].describe())
 
 
@@ -1,13 +1,17 @@
+from __future__ import annotations
+
 import logging
-import ta
-import pandas as pd
+import math
 
-from typing import Dict
-from polygon.websocket.models import EquityAgg, EquityQuote
+from typing import TYPE_CHECKING, Dict
 from common import BaseEngine
 from common.models import Order, EngineConfig
 
+if TYPE_CHECKING:
+    from polygon.websocket.models import EquityAgg, EquityQuote
+
 MIN_BARS = 32
+EMA_WINDOW = 15
 
 def midpt(quote: EquityQuote) -> float:
     return (quote.ask_price + quote.bid_price) / 2.0
@@ -18,26 +22,31 @@ class Engine(BaseEngine):
         self.symbol = self.config.symbol
         self.trigger_symbol = trigger_symbol
         self.min_edge = min_edge
-        self.df = pd.DataFrame(columns=["timestamp", "symbol", "open", "high", "close"])
+        # incremental EMA of trigger closes; matches pandas ewm(span, adjust=False)
+        self.num_bars: int = 0
+        self.trigger_ema: float = math.nan
 
     def on_quote_update(self, quote: EquityQuote) -> None:
         super().on_quote_update(quote)
         if quote.symbol == self.symbol:
             self.eval()
 
+    def on_disconnect(self, feed: str) -> None:
+        super().on_disconnect(feed)
+        # bars from before the outage would price against post-outage quotes
+        if feed == "polygon":
+            self.num_bars = 0
+            self.trigger_ema = math.nan
+
     def on_agg_sec_update(self, agg: EquityAgg) -> None:
         super().on_agg_sec_update(agg)
-        self.df = self.df._append(
-            {
-                "timestamp": agg.end_timestamp,
-                "symbol": agg.symbol,
-                "open": agg.open,
-                "high": agg.high,
-                "low": agg.low,
-                "close": agg.close,
-            },
-            ignore_index=True,
-        )
+        if agg.symbol == self.trigger_symbol:
+            alpha = 2.0 / (EMA_WINDOW + 1)
+            if self.num_bars == 0:
+                self.trigger_ema = agg.close
+            else:
+                self.trigger_ema = alpha * agg.close + (1 - alpha) * self.trigger_ema
+            self.num_bars += 1
 
         self.eval()
     
@@ -45,16 +54,15 @@ class Engine(BaseEngine):
         if not self.ready:
             return
 
-        quote = self.quotes[self.symbol]
+        quote = self.quotes.get(self.symbol)
         if quote is None:
             return
         
-        trigger_quote =  self.quotes[self.trigger_symbol]
+        trigger_quote =  self.quotes.get(self.trigger_symbol)
         if trigger_quote is None:
             return
         
-        df = self.df[self.df["symbol"] == self.trigger_symbol]
-        if len(df) < MIN_BARS:
+        if self.num_bars < MIN_BARS:
             return
         
         if len(self.open_orders) > 0:
@@ -62,7 +70,7 @@ class Engine(BaseEngine):
 
         mid = midpt(quote)
         trigger_mid = midpt(trigger_quote)
-        trigger_ema = ta.trend.EMAIndicator(close=df['close'], window=15, fillna=False).ema_indicator().iloc[-1]
+        trigger_ema = self.trigger_ema
 
         theo = (trigger_ema * mid) / trigger_mid
         if theo > quote.ask_price: